@@ -1,223 +1,427 @@
 import boto3
-import json
+import functools
 import logging
-import yaml
-from botocore.exceptions import ClientError, NoCredentialsError
+import orjson
+import threading
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+
+from config import load_config  # Re-exported: callers load config through the analyzer
+from models import BucketRecord, Issue
 
 logger = logging.getLogger(__name__)
 
-def load_config(config_path='config.yaml'):
-    """Loads configuration from YAML file."""
+# Number of buckets analyzed concurrently unless config.yaml sets max_workers
+DEFAULT_MAX_WORKERS = 32
+
+# Severity of each issue type when config.yaml does not override it
+DEFAULT_RISK_WEIGHTS = {
+    'public_access_enabled': 100,
+    'acl_public_read': 80,
+    'policy_public_read': 90,
+    'encryption_disabled': 40,
+    'versioning_disabled': 20,
+    'logging_disabled': 15
+}
+
+def get_max_workers(config):
+    """
+    Reads the number of buckets analyzed concurrently from the configuration.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        int: The configured max_workers, or DEFAULT_MAX_WORKERS if it is unset or invalid
+    """
+    value = config.get('max_workers')
+    if value is None:
+        return DEFAULT_MAX_WORKERS
     try:
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        logger.error(f"Error loading configuration {config_path}: {e}", exc_info=True)
-        return None
+        max_workers = int(value)
+    except (TypeError, ValueError):
+        max_workers = 0
+    if max_workers < 1:
+        logger.error("Invalid max_workers %r in configuration, must be a positive integer. Using %s.",
+                     value, DEFAULT_MAX_WORKERS)
+        return DEFAULT_MAX_WORKERS
+    return max_workers
+
+@functools.lru_cache(maxsize=None)
+def _get_session():
+    # One session per process: each session loads and parses the S3 service model and
+    # endpoint data on first use, so clients created from it share that work.
+    # Sessions are not thread-safe; create clients from the main thread or under a lock
+    return boto3.session.Session()
 
-def get_s3_client():
-    """Creates an S3 client."""
+def get_s3_client(max_pool_connections=DEFAULT_MAX_WORKERS):
+    """Creates an S3 client sized for max_pool_connections concurrent requests."""
     try:
         # Boto3 will automatically use credentials from env vars, ~/.aws/credentials, etc.
-        s3 = boto3.client('s3')
-        # Test connection/credentials by listing buckets
-        s3.list_buckets()
-        logger.info("Successfully created S3 client and verified credentials.")
+        session = _get_session()
+        # Resolve credentials locally instead of probing with ListBuckets; main.py lists
+        # buckets right away, so rejected credentials still surface on that first call
+        if session.get_credentials() is None:
+            logger.error("AWS credentials not found. Configure AWS CLI or environment variables.")
+            return None
+        s3 = session.client('s3', config=Config(
+            # Keep one pooled connection per worker so concurrent checks reuse
+            # connections instead of discarding them beyond botocore's default of 10
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=True,
+            # Adaptive mode backs off with jitter and rate-limits the client on
+            # SlowDown/503 throttling; allow enough attempts to ride out a burst
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            # Fail fast on a slow endpoint rather than stalling a worker
+            connect_timeout=3,
+            read_timeout=10
+        ))
+        logger.info("Successfully created S3 client.")
         return s3
-    except NoCredentialsError:
-        logger.error("AWS credentials not found. Configure AWS CLI or environment variables.")
-        return None
-    except ClientError as e:
-        # Handle potential errors like InvalidClientTokenId
-        logger.error(f"AWS ClientError creating S3 client: {e}", exc_info=True)
-        return None
     except Exception as e:
-        logger.error(f"Unexpected error creating S3 client: {e}", exc_info=True)
+        logger.error("Unexpected error creating S3 client: %s", e, exc_info=True)
         return None
 
 def list_buckets(s3_client):
-    """Lists all S3 buckets accessible by the client."""
-    if not s3_client: return []
+    """
+    Lists all S3 buckets accessible by the client, including each bucket's region.
+    
+    Buckets are yielded page by page as they are listed, so analysis of the first
+    page can start before the listing of large accounts finishes.
+    
+    Args:
+        s3_client: Boto3 S3 client
+        
+    Yields:
+        dict: S3 bucket dictionary
+    """
+    if not s3_client: return
     try:
-        response = s3_client.list_buckets()
-        buckets = response.get('Buckets', [])
-        logger.info(f"Found {len(buckets)} buckets.")
-        return buckets
+        # Paginated ListBuckets (sending MaxBuckets) also returns BucketRegion,
+        # sparing a GetBucketLocation call per bucket during analysis
+        if s3_client.can_paginate('list_buckets'):
+            pages = s3_client.get_paginator('list_buckets').paginate(PaginationConfig={'PageSize': 1000})
+        else:
+            # Older botocore has no ListBuckets paginator; a single unpaginated call
+            # lists every bucket, and regions are looked up during analysis instead
+            pages = [s3_client.list_buckets()]
+        bucket_count = 0
+        for page in pages:
+            page_buckets = page.get('Buckets', [])
+            bucket_count += len(page_buckets)
+            yield from page_buckets
+        logger.info("Found %s buckets.", bucket_count)
     except ClientError as e:
-        logger.error(f"Error listing S3 buckets: {e}", exc_info=True)
-        return []
+        logger.error("Error listing S3 buckets: %s", e, exc_info=True)
     except Exception as e:
-        logger.error(f"Unexpected error listing S3 buckets: {e}", exc_info=True)
-        return []
+        logger.error("Unexpected error listing S3 buckets: %s", e, exc_info=True)
 
-def analyze_buckets(s3_client, buckets, config):
+def _head_bucket(s3_client, bucket_name):
+    """Returns a bucket dictionary if the bucket exists and is accessible, else None."""
+    try:
+        response = s3_client.head_bucket(Bucket=bucket_name)
+        return {'Name': bucket_name, 'BucketRegion': response.get('BucketRegion')}
+    except ClientError as e:
+        logger.warning("Skipping bucket %s: %s", bucket_name, e)
+    except Exception as e:
+        logger.error("Unexpected error checking bucket %s: %s", bucket_name, e, exc_info=True)
+    return None
+
+def get_buckets_by_name(s3_client, bucket_names, max_workers=DEFAULT_MAX_WORKERS):
     """
-    Analyzes S3 buckets for security issues based on the provided configuration.
+    Builds bucket dictionaries for an explicit list of bucket names.
+    
+    Each bucket is verified with a concurrent HeadBucket call, which avoids listing
+    (and parsing) every bucket in the account when only a few are wanted.
     
     Args:
         s3_client: Boto3 S3 client
-        buckets: List of S3 bucket dictionaries
-        config: Configuration dictionary with risk weights
+        bucket_names: Names of the buckets to analyze, or a single name
+        max_workers: Number of buckets probed concurrently
         
     Returns:
-        list: List of analyzed bucket data dictionaries with security findings
+        list: Bucket dictionaries for the buckets that exist and are accessible
     """
-    if not s3_client or not buckets:
+    if not s3_client or not bucket_names: return []
+    # A single name may be given without a list
+    if isinstance(bucket_names, str):
+        bucket_names = [bucket_names]
+    elif not isinstance(bucket_names, (list, tuple)):
+        logger.error("Invalid buckets %r in configuration, must be a list of bucket names.", bucket_names)
         return []
+    # Analyze each configured bucket once, keeping the configured order
+    bucket_names = list(dict.fromkeys(bucket_names))
+    probe = functools.partial(_head_bucket, s3_client)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        buckets = [bucket for bucket in executor.map(probe, bucket_names) if bucket]
+    logger.info("Found %s of %s configured buckets.", len(buckets), len(bucket_names))
+    return buckets
+
+def _normalize_region(location_constraint):
+    """Maps a GetBucketLocation LocationConstraint to a region name."""
+    # us-east-1 buckets report no constraint and legacy eu-west-1 buckets report 'EU'
+    if not location_constraint:
+        return 'us-east-1'
+    if location_constraint == 'EU':
+        return 'eu-west-1'
+    return location_constraint
+
+def _is_public_principal(principal):
+    """Returns True if a policy Principal matches everyone."""
+    if principal == '*':
+        return True
+    if isinstance(principal, dict):
+        return any(value == '*' or (isinstance(value, list) and '*' in value) for value in principal.values())
+    return False
+
+def _policy_allows_public(policy):
+    """Returns True if any Allow statement in a parsed bucket policy has a public principal."""
+    statements = policy.get('Statement', [])
+    # A policy with a single statement may give it as an object instead of a list
+    if isinstance(statements, dict):
+        statements = [statements]
+    return any(
+        statement.get('Effect') == 'Allow' and _is_public_principal(statement.get('Principal'))
+        for statement in statements
+    )
+
+class _RegionalClients:
+    """
+    Thread-safe cache of S3 clients keyed by region.
+    Calls made against a bucket's own region avoid the redirect round-trip that
+    botocore otherwise takes on every request to an out-of-region bucket.
+    """
+    
+    def __init__(self, s3_client):
+        self.s3_client = s3_client
+        self.clients = {s3_client.meta.region_name: s3_client}
+        self.lock = threading.Lock()
         
-    analyzed_data = []
-    risk_weights = config.get('risk_weights', {})
+    def get(self, region):
+        client = self.clients.get(region)
+        if client is not None:
+            return client
+        # Client creation is not thread-safe, and one client per region is enough
+        with self.lock:
+            client = self.clients.get(region)
+            if client is None:
+                client = _get_session().client(
+                    's3', region_name=region, config=self.s3_client.meta.config
+                )
+                self.clients[region] = client
+            return client
+
+def _add_issue(bucket_data, issue_type, description, severity, details):
+    """Records an issue on the bucket and adds its severity to the risk score."""
+    bucket_data.issues.append(Issue(issue_type, description, severity, details))
+    bucket_data.risk_score += severity
+
+def _analyze_bucket(s3_client, bucket, risk_weights, regional_clients):
+    """
+    Runs all security checks against a single bucket.
+
+    Args:
+        s3_client: Boto3 S3 client
+        bucket: S3 bucket dictionary as returned by list_buckets
+        risk_weights: Mapping of every issue type to its severity
+        regional_clients: _RegionalClients cache used for the per-bucket checks
+
+    Returns:
+        BucketRecord: Analyzed bucket data, or None if the bucket could not be analyzed
+    """
+    bucket_name = bucket.get('Name', '')
+    if not bucket_name:
+        return None
+        
+    logger.info("Analyzing bucket: %s", bucket_name)
     
-    logger.info(f"Beginning security analysis of {len(buckets)} buckets")
+    # Initialize bucket data
+    bucket_data = BucketRecord(
+        name=bucket_name,
+        creation_date=bucket.get('CreationDate'),
+        region=None,  # Will be populated if available
+        issues=[],
+        risk_score=0
+    )
     
-    for bucket in buckets:
-        bucket_name = bucket.get('Name', '')
-        if not bucket_name:
-            continue
-            
-        logger.info(f"Analyzing bucket: {bucket_name}")
-        
-        # Initialize bucket data
-        bucket_data = {
-            'name': bucket_name,
-            'creation_date': bucket.get('CreationDate'),
-            'region': None,  # Will be populated if available
-            'issues': [],
-            'risk_score': 0
-        }
+    try:
+        # Get bucket location, unless listing the bucket already reported it
+        region = bucket.get('BucketRegion')
+        if not region:
+            location = s3_client.get_bucket_location(Bucket=bucket_name)
+            region = _normalize_region(location.get('LocationConstraint'))
+        bucket_data.region = region
+        # Run the remaining checks against the bucket's own regional endpoint
+        regional_client = regional_clients.get(region)
         
+        # Check block public access settings
+        ignore_public_acls = False
         try:
-            # Get bucket location
-            location = s3_client.get_bucket_location(Bucket=bucket_name)
-            bucket_data['region'] = location.get('LocationConstraint', 'us-east-1')
+            public_access = regional_client.get_public_access_block(Bucket=bucket_name)
+            block_public_acls = public_access.get('PublicAccessBlockConfiguration', {}).get('BlockPublicAcls', False)
+            block_public_policy = public_access.get('PublicAccessBlockConfiguration', {}).get('BlockPublicPolicy', False)
+            ignore_public_acls = public_access.get('PublicAccessBlockConfiguration', {}).get('IgnorePublicAcls', False)
+            restrict_public_buckets = public_access.get('PublicAccessBlockConfiguration', {}).get('RestrictPublicBuckets', False)
             
-            # Check block public access settings
-            try:
-                public_access = s3_client.get_public_access_block(Bucket=bucket_name)
-                block_public_acls = public_access.get('PublicAccessBlockConfiguration', {}).get('BlockPublicAcls', False)
-                block_public_policy = public_access.get('PublicAccessBlockConfiguration', {}).get('BlockPublicPolicy', False)
-                ignore_public_acls = public_access.get('PublicAccessBlockConfiguration', {}).get('IgnorePublicAcls', False)
-                restrict_public_buckets = public_access.get('PublicAccessBlockConfiguration', {}).get('RestrictPublicBuckets', False)
-                
-                if not (block_public_acls and block_public_policy and ignore_public_acls and restrict_public_buckets):
-                    issue = {
-                        'type': 'public_access_enabled',
-                        'description': 'Block Public Access is not fully enabled',
-                        'severity': risk_weights.get('public_access_enabled', 100),
-                        'details': {
-                            'BlockPublicAcls': block_public_acls,
-                            'BlockPublicPolicy': block_public_policy,
-                            'IgnorePublicAcls': ignore_public_acls,
-                            'RestrictPublicBuckets': restrict_public_buckets
-                        }
-                    }
-                    bucket_data['issues'].append(issue)
-                    bucket_data['risk_score'] += issue['severity']
-            except ClientError as e:
-                if e.response['Error']['Code'] == 'NoSuchPublicAccessBlockConfiguration':
-                    # Public access block is not configured, which is a security issue
-                    issue = {
-                        'type': 'public_access_enabled',
-                        'description': 'Block Public Access is not configured',
-                        'severity': risk_weights.get('public_access_enabled', 100),
-                        'details': {'error': 'NoSuchPublicAccessBlockConfiguration'}
+            if not (block_public_acls and block_public_policy and ignore_public_acls and restrict_public_buckets):
+                _add_issue(
+                    bucket_data, 'public_access_enabled', 'Block Public Access is not fully enabled',
+                    risk_weights['public_access_enabled'], {
+                        'BlockPublicAcls': block_public_acls,
+                        'BlockPublicPolicy': block_public_policy,
+                        'IgnorePublicAcls': ignore_public_acls,
+                        'RestrictPublicBuckets': restrict_public_buckets
                     }
-                    bucket_data['issues'].append(issue)
-                    bucket_data['risk_score'] += issue['severity']
-                else:
-                    logger.warning(f"Error checking public access block for {bucket_name}: {e}")
-            
-            # Check bucket ACL
+                )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchPublicAccessBlockConfiguration':
+                # Public access block is not configured, which is a security issue
+                _add_issue(
+                    bucket_data, 'public_access_enabled', 'Block Public Access is not configured',
+                    risk_weights['public_access_enabled'], {'error': 'NoSuchPublicAccessBlockConfiguration'}
+                )
+            else:
+                logger.warning("Error checking public access block for %s: %s", bucket_name, e)
+        
+        # Check bucket ACL, unless public grants are already ignored by Block Public Access
+        if not ignore_public_acls:
             try:
-                acl = s3_client.get_bucket_acl(Bucket=bucket_name)
+                acl = regional_client.get_bucket_acl(Bucket=bucket_name)
                 for grant in acl.get('Grants', []):
                     grantee = grant.get('Grantee', {})
                     if grantee.get('URI') == 'http://acs.amazonaws.com/groups/global/AllUsers':
-                        issue = {
-                            'type': 'acl_public_read',
-                            'description': 'Bucket ACL allows public access',
-                            'severity': risk_weights.get('acl_public_read', 80),
-                            'details': {'grant': grant}
-                        }
-                        bucket_data['issues'].append(issue)
-                        bucket_data['risk_score'] += issue['severity']
+                        _add_issue(
+                            bucket_data, 'acl_public_read', 'Bucket ACL allows public access',
+                            risk_weights['acl_public_read'], {'grant': grant}
+                        )
                         break
             except ClientError as e:
-                logger.warning(f"Error checking ACL for {bucket_name}: {e}")
-            
-            # Check bucket policy
+                logger.warning("Error checking ACL for %s: %s", bucket_name, e)
+        
+        # Check bucket policy status; S3 evaluates the policy itself, so the document
+        # is only fetched when it is public (for the report) or the status is unavailable
+        policy_is_public = None
+        try:
+            policy_status = regional_client.get_bucket_policy_status(Bucket=bucket_name)
+            policy_is_public = policy_status.get('PolicyStatus', {}).get('IsPublic', False)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchBucketPolicy':
+                policy_is_public = False
+            else:
+                logger.debug("Policy status unavailable for %s, inspecting policy instead: %s", bucket_name, e)
+        
+        # Check bucket policy
+        if policy_is_public is not False:
             try:
-                policy = s3_client.get_bucket_policy(Bucket=bucket_name)
+                policy = regional_client.get_bucket_policy(Bucket=bucket_name)
                 policy_str = policy.get('Policy', '{}')
-                policy_json = json.loads(policy_str) if policy_str else {}
+                policy_json = orjson.loads(policy_str) if policy_str else {}
                 
-                # Very basic check for public policy - comprehensive check would need full policy evaluation
-                if '"Principal": "*"' in policy_str or '"Principal": {"AWS": "*"}' in policy_str:
-                    issue = {
-                        'type': 'policy_public_read',
-                        'description': 'Bucket policy may allow public access',
-                        'severity': risk_weights.get('policy_public_read', 90),
-                        'details': {'policy': policy_json}
-                    }
-                    bucket_data['issues'].append(issue)
-                    bucket_data['risk_score'] += issue['severity']
+                # Without a policy status, fall back to a basic check - conditions are not evaluated
+                if policy_is_public or _policy_allows_public(policy_json):
+                    _add_issue(
+                        bucket_data, 'policy_public_read', 'Bucket policy may allow public access',
+                        risk_weights['policy_public_read'], {'policy': policy_json}
+                    )
             except ClientError as e:
                 if e.response['Error']['Code'] != 'NoSuchBucketPolicy':
-                    logger.warning(f"Error checking policy for {bucket_name}: {e}")
-            
-            # Check encryption
-            try:
-                encryption = s3_client.get_bucket_encryption(Bucket=bucket_name)
-                # If we got here, encryption is enabled
-            except ClientError as e:
-                if e.response['Error']['Code'] == 'ServerSideEncryptionConfigurationNotFoundError':
-                    issue = {
-                        'type': 'encryption_disabled',
-                        'description': 'Default encryption is not enabled',
-                        'severity': risk_weights.get('encryption_disabled', 40),
-                        'details': {'error': 'ServerSideEncryptionConfigurationNotFoundError'}
-                    }
-                    bucket_data['issues'].append(issue)
-                    bucket_data['risk_score'] += issue['severity']
-                else:
-                    logger.warning(f"Error checking encryption for {bucket_name}: {e}")
-            
-            # Check versioning
-            try:
-                versioning = s3_client.get_bucket_versioning(Bucket=bucket_name)
-                if versioning.get('Status') != 'Enabled':
-                    issue = {
-                        'type': 'versioning_disabled',
-                        'description': 'Bucket versioning is not enabled',
-                        'severity': risk_weights.get('versioning_disabled', 20),
-                        'details': {'versioning': versioning}
-                    }
-                    bucket_data['issues'].append(issue)
-                    bucket_data['risk_score'] += issue['severity']
-            except ClientError as e:
-                logger.warning(f"Error checking versioning for {bucket_name}: {e}")
-            
-            # Check logging
-            try:
-                logging_config = s3_client.get_bucket_logging(Bucket=bucket_name)
-                if 'LoggingEnabled' not in logging_config:
-                    issue = {
-                        'type': 'logging_disabled',
-                        'description': 'Bucket logging is not enabled',
-                        'severity': risk_weights.get('logging_disabled', 15),
-                        'details': {'logging': False}
-                    }
-                    bucket_data['issues'].append(issue)
-                    bucket_data['risk_score'] += issue['severity']
-            except ClientError as e:
-                logger.warning(f"Error checking logging for {bucket_name}: {e}")
-            
-            analyzed_data.append(bucket_data)
-            
+                    logger.warning("Error checking policy for %s: %s", bucket_name, e)
+        
+        # Check encryption
+        try:
+            encryption = regional_client.get_bucket_encryption(Bucket=bucket_name)
+            # If we got here, encryption is enabled
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ServerSideEncryptionConfigurationNotFoundError':
+                _add_issue(
+                    bucket_data, 'encryption_disabled', 'Default encryption is not enabled',
+                    risk_weights['encryption_disabled'], {'error': 'ServerSideEncryptionConfigurationNotFoundError'}
+                )
+            else:
+                logger.warning("Error checking encryption for %s: %s", bucket_name, e)
+        
+        # Check versioning
+        try:
+            versioning = regional_client.get_bucket_versioning(Bucket=bucket_name)
+            if versioning.get('Status') != 'Enabled':
+                _add_issue(
+                    bucket_data, 'versioning_disabled', 'Bucket versioning is not enabled',
+                    risk_weights['versioning_disabled'], {'versioning': versioning}
+                )
         except ClientError as e:
-            logger.error(f"Error analyzing bucket {bucket_name}: {e}", exc_info=True)
-        except Exception as e:
-            logger.error(f"Unexpected error analyzing bucket {bucket_name}: {e}", exc_info=True)
+            logger.warning("Error checking versioning for %s: %s", bucket_name, e)
+        
+        # Check logging
+        try:
+            logging_config = regional_client.get_bucket_logging(Bucket=bucket_name)
+            if 'LoggingEnabled' not in logging_config:
+                _add_issue(
+                    bucket_data, 'logging_disabled', 'Bucket logging is not enabled',
+                    risk_weights['logging_disabled'], {'logging': False}
+                )
+        except ClientError as e:
+            logger.warning("Error checking logging for %s: %s", bucket_name, e)
+        
+        return bucket_data
+        
+    except ClientError as e:
+        logger.error("Error analyzing bucket %s: %s", bucket_name, e, exc_info=True)
+    except Exception as e:
+        logger.error("Unexpected error analyzing bucket %s: %s", bucket_name, e, exc_info=True)
+    return None
+
+def iter_analyze_buckets(s3_client, buckets, config, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Analyzes S3 buckets for security issues, yielding each result as soon as it is ready.
+    
+    Buckets are analyzed concurrently since every check is a network round-trip;
+    the shared client is thread-safe. Results are yielded while later buckets are
+    still being analyzed, so callers can save them in the meantime.
     
-    logger.info(f"Completed analysis of {len(analyzed_data)} buckets")
-    return analyzed_data
+    Args:
+        s3_client: Boto3 S3 client
+        buckets: Iterable of S3 bucket dictionaries, consumed as it is produced
+        config: Configuration dictionary with risk weights
+        max_workers: Number of buckets analyzed concurrently, as from get_max_workers
+        
+    Yields:
+        BucketRecord: Analyzed bucket data with security findings
+    """
+    if not s3_client:
+        return
+        
+    # Resolve every weight once per scan rather than on each issue
+    risk_weights = {**DEFAULT_RISK_WEIGHTS, **(config.get('risk_weights') or {})}
+    
+    logger.info("Beginning security analysis of buckets")
+    
+    analyze = functools.partial(
+        _analyze_bucket, s3_client,
+        risk_weights=risk_weights,
+        regional_clients=_RegionalClients(s3_client)
+    )
+    analyzed_count = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map() submits buckets as the listing produces them and preserves the
+        # input order, keeping reports stable between runs
+        for bucket_data in executor.map(analyze, buckets):
+            if bucket_data:
+                analyzed_count += 1
+                yield bucket_data
+    
+    logger.info("Completed analysis of %s buckets", analyzed_count)
+
+def analyze_buckets(s3_client, buckets, config):
+    """
+    Analyzes S3 buckets for security issues based on the provided configuration.
+    
+    Args:
+        s3_client: Boto3 S3 client
+        buckets: Iterable of S3 bucket dictionaries
+        config: Configuration dictionary with risk weights and worker count
+        
+    Returns:
+        list: List of BucketRecord objects with security findings
+    """
+    return list(iter_analyze_buckets(s3_client, buckets, config, get_max_workers(config)))
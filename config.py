@@ -0,0 +1,27 @@
+"""
+S3 Bucket Security Analyzer - Configuration
+Loads config.yaml once per process for the analyzer and the database handler.
+"""
+
+import functools
+import logging
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Use libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=None)
+def _read_config(config_path):
+    # Parsed once per path; callers share the result and must not mutate it
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+def load_config(config_path='config.yaml'):
+    """Loads configuration from YAML file."""
+    try:
+        return _read_config(config_path)
+    except Exception as e:
+        logger.error("Error loading configuration %s: %s", config_path, e, exc_info=True)
+        return None
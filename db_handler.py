@@ -5,13 +5,70 @@ Handles all database operations for storing and retrieving security analysis res
 
 import logging
 import sqlite3
-import yaml
-import json
+import itertools
+import orjson
 import os
+from collections import defaultdict
 from datetime import datetime
 
+from config import load_config
+
 logger = logging.getLogger(__name__)
 
+# Applied to every new connection: WAL lets readers run during writes and, with
+# synchronous=NORMAL, only fsyncs at checkpoints instead of on every commit
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA analysis_limit=1000",  # Keep ANALYZE cheap as history grows
+)
+
+# Insert statements shared by the single-row and bulk save paths. sqlite3 caches
+# compiled statements by their SQL text, so reusing one string skips re-parsing
+_SQL_INSERT_BUCKET = """
+INSERT INTO buckets
+(session_id, name, region, creation_date, risk_score)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_ISSUE = """
+INSERT INTO bucket_issues
+(bucket_id, issue_type, description, severity, details)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_SESSION = """
+UPDATE scan_sessions
+SET buckets_scanned = ?, issues_found = ?
+WHERE id = ?
+"""
+
+# Results may be saved in several batches per scan, so the totals accumulate
+_SQL_ADD_SESSION_TOTALS = """
+UPDATE scan_sessions
+SET buckets_scanned = buckets_scanned + ?, issues_found = issues_found + ?
+WHERE id = ?
+"""
+
+# Columns of the buckets table, used to split joined bucket/issue rows
+_BUCKET_COLUMNS = ('id', 'session_id', 'name', 'region', 'creation_date', 'risk_score')
+
+def _parse_issue_details(issue):
+    # Parse the JSON details column of an issue row in place
+    raw = issue['details']
+    if raw:
+        try:
+            issue['details'] = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            logger.warning("Could not parse JSON details for issue ID %s", issue['id'])
+            if isinstance(raw, bytes):
+                issue['details'] = raw.decode('utf-8', 'replace')
+    return issue
+
 class DatabaseHandler:
     """
     Handles database operations for the AWS Security Group Analyzer.
@@ -25,8 +82,8 @@ class DatabaseHandler:
     def _load_db_config(self, config_path):
         # Load database configuration from YAML file
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            # Shares the cached parse with analyzer.load_config instead of re-reading the file
+            config = load_config(config_path) or {}
                 
             # Get sqlite configuration or use defaults
             if 'sqlite' not in config:
@@ -36,7 +93,7 @@ class DatabaseHandler:
                 }
             return config['sqlite']
         except Exception as e:
-            logger.error(f"Error loading database configuration: {e}", exc_info=True)
+            logger.error("Error loading database configuration: %s", e, exc_info=True)
             return {'db_file': 's3_analyzer.db'}
             
     def connect(self):
@@ -53,13 +110,16 @@ class DatabaseHandler:
                 os.makedirs(db_dir)
                 
             # Connect to SQLite database
-            self.connection = sqlite3.connect(db_file)
+            # Autocommit mode: multi-statement writes open their own transactions explicitly
+            self.connection = sqlite3.connect(db_file, isolation_level=None)
             # Configure SQLite connection to return dictionaries instead of tuples
             self.connection.row_factory = sqlite3.Row
-            logger.info(f"Successfully connected to SQLite database: {db_file}")
+            for pragma in _CONNECTION_PRAGMAS:
+                self.connection.execute(pragma)
+            logger.info("Successfully connected to SQLite database: %s", db_file)
             return True
         except Exception as e:
-            logger.error(f"Error connecting to database: {e}", exc_info=True)
+            logger.error("Error connecting to database: %s", e, exc_info=True)
             return False
             
     def initialize_tables(self):
@@ -104,16 +164,22 @@ class DatabaseHandler:
                 issue_type TEXT NOT NULL,
                 description TEXT NOT NULL,
                 severity INTEGER NOT NULL,
-                details TEXT,
+                details BLOB,
                 FOREIGN KEY (bucket_id) REFERENCES buckets(id)
             )
             """)
             
+            # Indexes backing the session, high-risk and history lookups
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_buckets_session ON buckets(session_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_buckets_risk ON buckets(risk_score DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_date ON scan_sessions(scan_date DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_issues_bucket ON bucket_issues(bucket_id)")
+            
             self.connection.commit()
             logger.info("Database tables initialized successfully")
             return True
         except Exception as e:
-            logger.error(f"Error initializing database tables: {e}", exc_info=True)
+            logger.error("Error initializing database tables: %s", e, exc_info=True)
             return False
     
     def create_scan_session(self, aws_account_id=None, region=None):
@@ -139,10 +205,10 @@ class DatabaseHandler:
             
             self.connection.commit()
             session_id = cursor.lastrowid
-            logger.info(f"Created scan session with ID: {session_id}")
+            logger.info("Created scan session with ID: %s", session_id)
             return session_id
         except Exception as e:
-            logger.error(f"Error creating scan session: {e}", exc_info=True)
+            logger.error("Error creating scan session: %s", e, exc_info=True)
             if self.connection:
                 self.connection.rollback()
             return None
@@ -155,18 +221,13 @@ class DatabaseHandler:
             
         try:
             cursor = self.connection.cursor()
-            sql = """
-            UPDATE scan_sessions
-            SET buckets_scanned = ?, issues_found = ?
-            WHERE id = ?
-            """
-            cursor.execute(sql, (buckets_scanned, issues_found, session_id))
+            cursor.execute(_SQL_UPDATE_SESSION, (buckets_scanned, issues_found, session_id))
             
             self.connection.commit()
-            logger.info(f"Updated scan session {session_id} with {buckets_scanned} buckets and {issues_found} issues")
+            logger.info("Updated scan session %s with %s buckets and %s issues", session_id, buckets_scanned, issues_found)
             return True
         except Exception as e:
-            logger.error(f"Error updating scan session: {e}", exc_info=True)
+            logger.error("Error updating scan session: %s", e, exc_info=True)
             if self.connection:
                 self.connection.rollback()
             return False
@@ -184,12 +245,7 @@ class DatabaseHandler:
             if isinstance(creation_date, datetime):
                 creation_date = creation_date.isoformat()
                 
-            sql = """
-            INSERT INTO buckets
-            (session_id, name, region, creation_date, risk_score)
-            VALUES (?, ?, ?, ?, ?)
-            """
-            cursor.execute(sql, (
+            cursor.execute(_SQL_INSERT_BUCKET, (
                 session_id,
                 name,
                 region,
@@ -199,10 +255,10 @@ class DatabaseHandler:
             
             self.connection.commit()
             bucket_id = cursor.lastrowid
-            logger.debug(f"Saved bucket {name} with ID: {bucket_id}")
+            logger.debug("Saved bucket %s with ID: %s", name, bucket_id)
             return bucket_id
         except Exception as e:
-            logger.error(f"Error saving bucket {name}: {e}", exc_info=True)
+            logger.error("Error saving bucket %s: %s", name, e, exc_info=True)
             if self.connection:
                 self.connection.rollback()
             return None
@@ -216,15 +272,10 @@ class DatabaseHandler:
         try:
             cursor = self.connection.cursor()
             
-            # Convert details dict to JSON string
-            details_json = json.dumps(details) if details else None
+            # Store details as compact JSON bytes
+            details_json = orjson.dumps(details) if details else None
             
-            sql = """
-            INSERT INTO bucket_issues
-            (bucket_id, issue_type, description, severity, details)
-            VALUES (?, ?, ?, ?, ?)
-            """
-            cursor.execute(sql, (
+            cursor.execute(_SQL_INSERT_ISSUE, (
                 bucket_id,
                 issue_type,
                 description,
@@ -234,14 +285,136 @@ class DatabaseHandler:
             
             self.connection.commit()
             issue_id = cursor.lastrowid
-            logger.debug(f"Saved issue {issue_type} for bucket ID {bucket_id}")
+            logger.debug("Saved issue %s for bucket ID %s", issue_type, bucket_id)
             return issue_id
         except Exception as e:
-            logger.error(f"Error saving bucket issue: {e}", exc_info=True)
+            logger.error("Error saving bucket issue: %s", e, exc_info=True)
             if self.connection:
                 self.connection.rollback()
             return None
     
+    def save_scan_results(self, session_id, analyzed_data):
+        # Save a batch of analyzed buckets and their issues, and add its totals to the
+        # scan session, in a single transaction. Call update_statistics() once all
+        # batches are saved
+        if not self.connection:
+            logger.error("Cannot save scan results: No database connection")
+            return None
+            
+        try:
+            cursor = self.connection.cursor()
+            # Take the write lock up front rather than upgrading mid-transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            bucket_rows = []
+            for bucket_data in analyzed_data:
+                # Convert creation_date to string if it's a datetime
+                creation_date = bucket_data.creation_date
+                if isinstance(creation_date, datetime):
+                    creation_date = creation_date.isoformat()
+                bucket_rows.append((
+                    session_id,
+                    bucket_data.name,
+                    bucket_data.region,
+                    creation_date,
+                    bucket_data.risk_score
+                ))
+            
+            # executemany doesn't report row IDs, so read back the ones just assigned.
+            # The write lock is held, so every row above the previous maximum is ours,
+            # numbered in insertion order; match them up by position rather than by name
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM buckets")
+            last_id = cursor.fetchone()[0]
+            cursor.executemany(_SQL_INSERT_BUCKET, bucket_rows)
+            cursor.execute("SELECT id FROM buckets WHERE id > ? ORDER BY id", (last_id,))
+            bucket_ids = [row['id'] for row in cursor.fetchall()]
+            
+            issue_rows = []
+            for bucket_id, bucket_data in zip(bucket_ids, analyzed_data):
+                for issue in bucket_data.issues:
+                    issue_rows.append((
+                        bucket_id,
+                        issue.type,
+                        issue.description,
+                        issue.severity,
+                        orjson.dumps(issue.details) if issue.details else None
+                    ))
+            
+            cursor.executemany(_SQL_INSERT_ISSUE, issue_rows)
+            cursor.execute(_SQL_ADD_SESSION_TOTALS, (len(analyzed_data), len(issue_rows), session_id))
+            
+            # One commit (and fsync) for the whole batch instead of one per row
+            self.connection.commit()
+            logger.info("Saved %s buckets and %s issues for session %s", len(analyzed_data), len(issue_rows), session_id)
+            return len(issue_rows)
+        except Exception as e:
+            logger.error("Error saving scan results: %s", e, exc_info=True)
+            if self.connection:
+                self.connection.rollback()
+            return None
+    
+    def update_statistics(self):
+        # Refresh planner statistics after bulk inserts so the indexes get used
+        if not self.connection:
+            return
+        try:
+            self.connection.execute("ANALYZE")
+        except Exception as e:
+            logger.warning("Error updating database statistics: %s", e)
+    
+    def _get_bucket_issues(self, cursor, bucket_ids):
+        # Fetch issues for many buckets with one query per chunk instead of one per bucket,
+        # returning them grouped by bucket ID
+        issues = defaultdict(list)
+        # Stay well under SQLite's limit on bound parameters per statement
+        chunk_size = 500
+        for start in range(0, len(bucket_ids), chunk_size):
+            chunk = bucket_ids[start:start + chunk_size]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"SELECT * FROM bucket_issues WHERE bucket_id IN ({placeholders}) ORDER BY id", chunk)
+            for row in cursor.fetchall():
+                issue = _parse_issue_details(dict(row))
+                issues[issue['bucket_id']].append(issue)
+        return issues
+    
+    def _iter_scan_buckets(self, cursor, session_id):
+        # Yield each bucket of a session with its issues attached. A single LEFT JOIN
+        # ordered by bucket is grouped as it is read, so only one bucket is held at a time
+        cursor.execute("""
+        SELECT b.*, i.id AS issue_id, i.issue_type, i.description, i.severity, i.details
+        FROM buckets b
+        LEFT JOIN bucket_issues i ON i.bucket_id = b.id
+        WHERE b.session_id = ?
+        ORDER BY b.id, i.id
+        """, (session_id,))
+        for bucket_id, rows in itertools.groupby(cursor, key=lambda row: row['id']):
+            first = next(rows)
+            bucket = {key: first[key] for key in _BUCKET_COLUMNS}
+            bucket['issues'] = []
+            for row in itertools.chain((first,), rows):
+                # Buckets without issues come back as a single row of NULL issue columns
+                if row['issue_id'] is None:
+                    continue
+                bucket['issues'].append(_parse_issue_details({
+                    'id': row['issue_id'],
+                    'bucket_id': bucket_id,
+                    'issue_type': row['issue_type'],
+                    'description': row['description'],
+                    'severity': row['severity'],
+                    'details': row['details']
+                }))
+            yield bucket
+    
+    def iter_scan_buckets(self, session_id):
+        # Stream the buckets of a scan session, each with an 'issues' list
+        if not self.connection:
+            logger.error("Cannot get scan buckets: No database connection")
+            return
+            
+        try:
+            yield from self._iter_scan_buckets(self.connection.cursor(), session_id)
+        except Exception as e:
+            logger.error("Error getting scan buckets: %s", e, exc_info=True)
+    
     def get_scan_history(self, limit=10):
         # Get history of recent scan sessions
         if not self.connection:
@@ -259,7 +432,7 @@ class DatabaseHandler:
             result = [dict(row) for row in cursor.fetchall()]
             return result
         except Exception as e:
-            logger.error(f"Error getting scan history: {e}", exc_info=True)
+            logger.error("Error getting scan history: %s", e, exc_info=True)
             return []
     
     def get_scan_results(self, session_id):
@@ -282,33 +455,17 @@ class DatabaseHandler:
             if row:
                 result['session'] = dict(row)
             else:
-                logger.warning(f"Scan session {session_id} not found")
+                logger.warning("Scan session %s not found", session_id)
                 return None
             
-            # Get buckets for this session
-            cursor.execute("SELECT * FROM buckets WHERE session_id = ?", (session_id,))
-            buckets = [dict(row) for row in cursor.fetchall()]
-            result['buckets'] = buckets
-            
-            # Get issues for each bucket
-            for bucket in buckets:
-                bucket_id = bucket['id']
-                cursor.execute("SELECT * FROM bucket_issues WHERE bucket_id = ?", (bucket_id,))
-                issues = []
-                for row in cursor.fetchall():
-                    issue = dict(row)
-                    # Parse JSON in details field
-                    if issue['details']:
-                        try:
-                            issue['details'] = json.loads(issue['details'])
-                        except json.JSONDecodeError:
-                            logger.warning(f"Could not parse JSON details for issue ID {issue['id']}")
-                    issues.append(issue)
-                result['issues'][bucket_id] = issues
+            # Get buckets for this session along with their issues
+            for bucket in self._iter_scan_buckets(cursor, session_id):
+                result['issues'][bucket['id']] = bucket.pop('issues')
+                result['buckets'].append(bucket)
             
             return result
         except Exception as e:
-            logger.error(f"Error getting scan results: {e}", exc_info=True)
+            logger.error("Error getting scan results: %s", e, exc_info=True)
             return None
     
     def get_high_risk_buckets(self, min_risk_score=50, limit=10):
@@ -330,24 +487,14 @@ class DatabaseHandler:
             cursor.execute(sql, (min_risk_score, limit))
             buckets = [dict(row) for row in cursor.fetchall()]
             
-            # Get issues for each bucket
+            # Get issues for all buckets at once
+            issues = self._get_bucket_issues(cursor, [bucket['id'] for bucket in buckets])
             for bucket in buckets:
-                cursor.execute("SELECT * FROM bucket_issues WHERE bucket_id = ?", (bucket['id'],))
-                issues = []
-                for row in cursor.fetchall():
-                    issue = dict(row)
-                    # Parse JSON in details field
-                    if issue['details']:
-                        try:
-                            issue['details'] = json.loads(issue['details'])
-                        except json.JSONDecodeError:
-                            logger.warning(f"Could not parse JSON details for issue ID {issue['id']}")
-                    issues.append(issue)
-                bucket['issues'] = issues
+                bucket['issues'] = issues[bucket['id']]
             
             return buckets
         except Exception as e:
-            logger.error(f"Error getting high risk buckets: {e}", exc_info=True)
+            logger.error("Error getting high risk buckets: %s", e, exc_info=True)
             return []
             
     def close(self):
@@ -1,10 +1,15 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
 import analyzer
 import reporter
 from db_handler import DatabaseHandler
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Number of analyzed buckets written to the database per transaction
+SAVE_BATCH_SIZE = 500
+
 if __name__ == "__main__":
     logging.info("Starting S3 Bucket Security Analyzer...")
     config = analyzer.load_config()
@@ -22,7 +27,9 @@ if __name__ == "__main__":
             db_handler.close()
             db_handler = None
     
-    s3_client = analyzer.get_s3_client()
+    # Match the connection pool to the number of buckets analyzed at once
+    max_workers = analyzer.get_max_workers(config)
+    s3_client = analyzer.get_s3_client(max_pool_connections=max_workers)
     if not s3_client:
         logging.critical("Failed to create S3 client. Check AWS credentials and permissions.")
         if db_handler:
@@ -36,54 +43,46 @@ if __name__ == "__main__":
         if not session_id:
             logging.warning("Failed to create scan session in database.")
     
-    # List S3 buckets
-    buckets = analyzer.list_buckets(s3_client)
+    # Probe only the configured buckets, or list every bucket in the account
+    bucket_names = config.get('buckets')
+    if bucket_names:
+        buckets = analyzer.get_buckets_by_name(s3_client, bucket_names, max_workers)
+    else:
+        buckets = analyzer.list_buckets(s3_client)
     
-    if buckets:
-        logging.info(f"Successfully retrieved {len(buckets)} buckets. Analysis phase next.")
-        analysed_data = analyzer.analyze_buckets(s3_client, buckets, config)
+    # Listing, analysis and saving overlap: buckets are analyzed as they are listed,
+    # and results are saved in batches as they arrive. The SQLite connection stays
+    # on this thread
+    save_results = db_handler and session_id
+    analysed_data = []
+    batch = []
+    for bucket_data in analyzer.iter_analyze_buckets(s3_client, buckets, config, max_workers):
+        analysed_data.append(bucket_data)
+        if save_results:
+            batch.append(bucket_data)
+            if len(batch) >= SAVE_BATCH_SIZE:
+                db_handler.save_scan_results(session_id, batch)
+                batch = []
+    
+    if analysed_data:
+        logging.info("Successfully analyzed %s buckets.", len(analysed_data))
         
-        # Save analysis results to database
-        if db_handler and session_id and analysed_data:
-            total_issues = 0
+        # Generate report in the background while the last batch is saved
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            report_formats = reporter.get_report_formats(config)
+            report_future = executor.submit(reporter.generate_report, analysed_data, formats=report_formats)
             
-            for bucket_data in analysed_data:
-                # Save bucket information
-                bucket_id = db_handler.save_bucket(
-                    session_id=session_id,
-                    name=bucket_data.get('name'),
-                    region=bucket_data.get('region'),
-                    creation_date=bucket_data.get('creation_date'),
-                    risk_score=bucket_data.get('risk_score', 0)
-                )
-                
-                if bucket_id:
-                    # Save bucket issues
-                    issues = bucket_data.get('issues', [])
-                    for issue in issues:
-                        db_handler.save_bucket_issue(
-                            bucket_id=bucket_id,
-                            issue_type=issue.get('type'),
-                            description=issue.get('description'),
-                            severity=issue.get('severity', 0),
-                            details=issue.get('details')
-                        )
-                    
-                    total_issues += len(issues)
+            # Save remaining analysis results to database
+            if save_results:
+                if batch:
+                    db_handler.save_scan_results(session_id, batch)
+                db_handler.update_statistics()
             
-            # Update scan session with results
-            db_handler.update_scan_session(
-                session_id=session_id,
-                buckets_scanned=len(analysed_data),
-                issues_found=total_issues
-            )
-            
-            logging.info(f"Saved scan results to database (session ID: {session_id})")
-        
-        # Generate report
-        reporter.generate_report(analysed_data)
+            # Surface any error raised while generating the report
+            if not report_future.result():
+                logging.warning("No report was generated.")
     else:
-        logging.warning("No buckets retrieved or an error occurred.")
+        logging.warning("No buckets retrieved or analyzed, or an error occurred.")
         if db_handler and session_id:
             db_handler.update_scan_session(
                 session_id=session_id,
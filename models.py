@@ -0,0 +1,34 @@
+"""
+S3 Bucket Security Analyzer - Models
+Lightweight records passed between the analyzer, database handler and reporter.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass
+class Issue:
+    """
+    A single security finding on a bucket.
+    Uses __slots__ instead of a per-instance dict to keep memory low on accounts with many findings.
+    """
+    __slots__ = ('type', 'description', 'severity', 'details')
+    
+    type: str
+    description: str
+    severity: int
+    details: dict
+
+@dataclass
+class BucketRecord:
+    """
+    The analysis result for one bucket: its metadata, findings and total risk score.
+    Uses __slots__ like Issue, since one record is kept per bucket until the report is written.
+    """
+    __slots__ = ('name', 'creation_date', 'region', 'issues', 'risk_score')
+    
+    name: str
+    creation_date: datetime
+    region: str
+    issues: list
+    risk_score: int
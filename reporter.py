@@ -4,96 +4,179 @@ Handles the generation of reports based on security analysis results.
 """
 
 import logging
-import json
+import orjson
 import os
 from datetime import datetime
+from operator import itemgetter
 
 logger = logging.getLogger(__name__)
 
-def generate_report(analyzed_data, output_dir="reports"):
+# Section separators for the text report
+_HR = "=" * 80 + "\n"
+_HR2 = "-" * 80 + "\n"
+
+# Report formats generate_report can write, and the default when none are configured
+REPORT_FORMATS = ("json", "txt")
+
+# From this many buckets on, the JSON report is written as newline-delimited JSON
+_NDJSON_THRESHOLD = 500
+
+def get_report_formats(config):
+    """
+    Reads the report formats to write from the configuration.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        tuple: The known formats from report_formats, or REPORT_FORMATS if it is unset or invalid
+    """
+    value = config.get('report_formats')
+    if value is None:
+        return REPORT_FORMATS
+    if isinstance(value, str):
+        value = [value]
+    elif not isinstance(value, (list, tuple)):
+        logger.error("Invalid report_formats %r in configuration, must be a list. Using %s.",
+                     value, list(REPORT_FORMATS))
+        return REPORT_FORMATS
+    formats = []
+    for name in value:
+        if name in REPORT_FORMATS:
+            formats.append(name)
+        else:
+            logger.warning("Ignoring unknown report format %r, expected one of %s", name, list(REPORT_FORMATS))
+    return tuple(formats)
+
+def _write_json_report(analyzed_data, report_path, ndjson=False):
+    """Saves the detailed report as JSON, or as one JSON record per line. Returns True on success."""
+    try:
+        # orjson serializes the BucketRecord and Issue dataclasses and datetimes natively; str() covers anything else
+        with open(report_path, 'wb') as f:
+            if ndjson:
+                # Compact and streamable: only one record is serialized at a time
+                for bucket in analyzed_data:
+                    f.write(orjson.dumps(bucket, default=str, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                f.write(orjson.dumps(analyzed_data, default=str, option=orjson.OPT_INDENT_2))
+        logger.info("Detailed JSON report saved to: %s", report_path)
+        return True
+    except Exception as e:
+        logger.error("Error saving JSON report: %s", e, exc_info=True)
+        return False
+
+def _write_text_report(analyzed_data, report_path, generated_at):
+    """Saves the human-readable text report. Returns True on success."""
+    try:
+        # Build the whole report in memory and write it once
+        parts = []
+        append = parts.append
+        
+        # Report header
+        append(_HR)
+        append(f"S3 BUCKET SECURITY ANALYSIS REPORT - {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        append(_HR + "\n")
+        
+        # Summary statistics and high-risk buckets, gathered in a single pass
+        total_buckets = len(analyzed_data)
+        buckets_with_issues = 0
+        total_issues = 0
+        high_risk_buckets = []
+        for bucket in analyzed_data:
+            issue_count = len(bucket.issues)
+            if issue_count:
+                buckets_with_issues += 1
+                total_issues += issue_count
+            risk_score = bucket.risk_score
+            if risk_score >= 50:
+                high_risk_buckets.append((risk_score, bucket.name))
+        
+        append(
+            f"SUMMARY:\n"
+            f"- Total buckets analyzed: {total_buckets}\n"
+            f"- Buckets with security issues: {buckets_with_issues}\n"
+            f"- Total issues identified: {total_issues}\n\n"
+        )
+        
+        # High-risk buckets
+        if high_risk_buckets:
+            append("HIGH RISK BUCKETS (Risk Score >= 50):\n")
+            # Sort on the pre-extracted score with a C-level key instead of a per-call lambda
+            high_risk_buckets.sort(key=itemgetter(0), reverse=True)
+            for risk_score, name in high_risk_buckets:
+                append(f"- {name} (Risk Score: {risk_score})\n")
+            append("\n")
+        
+        # Detailed findings for each bucket
+        append("DETAILED FINDINGS:\n")
+        for bucket in analyzed_data:
+            append(
+                _HR2 +
+                f"Bucket: {bucket.name}\n"
+                f"Region: {bucket.region}\n"
+                f"Creation Date: {bucket.creation_date}\n"
+                f"Risk Score: {bucket.risk_score}\n"
+            )
+            
+            issues = bucket.issues
+            if issues:
+                append(f"\nIssues ({len(issues)}):\n")
+                for i, issue in enumerate(issues, 1):
+                    append(f"  {i}. {issue.description} (Severity: {issue.severity})\n")
+            else:
+                append("\nNo security issues identified.\n")
+            append("\n")
+        
+        # Report footer
+        append(_HR + "END OF REPORT\n" + _HR)
+        
+        # Encode once and write bytes, bypassing the text-mode encoder layer
+        with open(report_path, 'wb') as f:
+            f.write("".join(parts).encode('utf-8'))
+        
+        logger.info("Text report saved to: %s", report_path)
+        return True
+    except Exception as e:
+        logger.error("Error generating text report: %s", e, exc_info=True)
+        return False
+
+def generate_report(analyzed_data, output_dir="reports", formats=REPORT_FORMATS):
     """
     Generates a report based on the analysis results.
     
     Args:
         analyzed_data: List of analyzed bucket data with security findings
         output_dir: Directory to save the report files
+        formats: Report formats to write, as from get_report_formats
         
     Returns:
-        str: Path to the generated report
+        str: Path to the generated report, or None if no report was written
     """
     if not analyzed_data:
         logger.warning("No data to generate report")
         return None
         
     # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        logger.error("Error creating report directory %s: %s", output_dir, e, exc_info=True)
+        return None
     
-    # Generate timestamp for report filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    json_report_path = os.path.join(output_dir, f"s3_security_report_{timestamp}.json")
+    # One timestamp for both filenames and the report header, so they always agree
+    generated_at = datetime.now()
+    timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
+    # Large scans get newline-delimited JSON, which is faster to write and to stream
+    ndjson = len(analyzed_data) >= _NDJSON_THRESHOLD
+    json_extension = "ndjson" if ndjson else "json"
+    json_report_path = os.path.join(output_dir, f"s3_security_report_{timestamp}.{json_extension}")
     txt_report_path = os.path.join(output_dir, f"s3_security_report_{timestamp}.txt")
     
-    # Save detailed report as JSON
-    try:
-        with open(json_report_path, 'w') as f:
-            json.dump(analyzed_data, f, indent=2, default=str)
-        logger.info(f"Detailed JSON report saved to: {json_report_path}")
-    except Exception as e:
-        logger.error(f"Error saving JSON report: {e}", exc_info=True)
-    
-    # Generate and save text report
-    try:
-        with open(txt_report_path, 'w') as f:
-            # Write report header
-            f.write("=" * 80 + "\n")
-            f.write(f"S3 BUCKET SECURITY ANALYSIS REPORT - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Summary statistics
-            total_buckets = len(analyzed_data)
-            buckets_with_issues = sum(1 for b in analyzed_data if b.get('issues'))
-            total_issues = sum(len(b.get('issues', [])) for b in analyzed_data)
-            
-            f.write(f"SUMMARY:\n")
-            f.write(f"- Total buckets analyzed: {total_buckets}\n")
-            f.write(f"- Buckets with security issues: {buckets_with_issues}\n")
-            f.write(f"- Total issues identified: {total_issues}\n\n")
-            
-            # High-risk buckets
-            high_risk_buckets = [b for b in analyzed_data if b.get('risk_score', 0) >= 50]
-            if high_risk_buckets:
-                f.write(f"HIGH RISK BUCKETS (Risk Score >= 50):\n")
-                for bucket in sorted(high_risk_buckets, key=lambda x: x.get('risk_score', 0), reverse=True):
-                    f.write(f"- {bucket['name']} (Risk Score: {bucket['risk_score']})\n")
-                f.write("\n")
-            
-            # Detailed findings for each bucket
-            f.write("DETAILED FINDINGS:\n")
-            for bucket in analyzed_data:
-                f.write("-" * 80 + "\n")
-                f.write(f"Bucket: {bucket['name']}\n")
-                f.write(f"Region: {bucket.get('region', 'unknown')}\n")
-                f.write(f"Creation Date: {bucket.get('creation_date', 'unknown')}\n")
-                f.write(f"Risk Score: {bucket.get('risk_score', 0)}\n")
-                
-                issues = bucket.get('issues', [])
-                if issues:
-                    f.write(f"\nIssues ({len(issues)}):\n")
-                    for i, issue in enumerate(issues, 1):
-                        f.write(f"  {i}. {issue['description']} (Severity: {issue['severity']})\n")
-                else:
-                    f.write("\nNo security issues identified.\n")
-                f.write("\n")
-            
-            # Report footer
-            f.write("=" * 80 + "\n")
-            f.write("END OF REPORT\n")
-            f.write("=" * 80 + "\n")
-        
-        logger.info(f"Text report saved to: {txt_report_path}")
-        return txt_report_path
-    except Exception as e:
-        logger.error(f"Error generating text report: {e}", exc_info=True)
-        return json_report_path  # Return JSON report path as fallback
+    report_path = None
+    if "json" in formats and _write_json_report(analyzed_data, json_report_path, ndjson):
+        report_path = json_report_path
+    if "txt" in formats and _write_text_report(analyzed_data, txt_report_path, generated_at):
+        report_path = txt_report_path
+    return report_path  # Text report preferred, JSON report as fallback
 
 # HTML report functionality to be implemented in the future
\ No newline at end of file